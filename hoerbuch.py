@@ -1,57 +1,103 @@
+import os
+
+# BLAS backends (OpenBLAS/MKL) size their thread pools when numpy is imported,
+# one thread per core by default. All of this program's parallelism goes
+# through onnxruntime's intra-op pool and the chapter worker pool, so extra
+# BLAS threads only oversubscribe the cores and thrash caches. setdefault
+# keeps an explicit user override working. Must run before numpy is imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
 import locale
 import sys
-import os
 import pathlib
 import re
+import json
+import functools
 import numpy as np
 import soundfile as sf
 import argparse
 import gettext
 import subprocess
 import logging
-from lxml import html
+import logging.handlers
+import queue
+import threading
+import atexit
+import collections
+import concurrent.futures
+import multiprocessing
 
 # --- Logging helper ---
+log = logging.getLogger("hoerbuch")
+_log_listener = None
+
 def setup_logging(debug=False):
+    global _log_listener
     logging.basicConfig(
         level=logging.DEBUG if debug else logging.ERROR,
         format="%(levelname)s: %(message)s"
     )
+    # Per-segment progress goes through this logger with deferred %-style
+    # formatting, so the strings aren't even built when INFO is disabled.
+    # Records are handed to a queue drained on a daemon thread: a slow TTY
+    # (ssh, journald redirect) then stalls the listener, not the synthesis
+    # loop that emitted the record.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.DEBUG if debug else logging.INFO)
+    log.propagate = False
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    # stop() drains the queue, so nothing is lost on a normal exit.
+    atexit.register(_log_listener.stop)
+
+# Detect debug flag early; controls Piper's stderr suppression below.
+DEBUG = "--debug" in sys.argv or "-d" in sys.argv
+
+# --- Lazy imports for the heavy dependencies ---
+# piper (which drags in onnxruntime), mutagen, lxml and the document-format
+# libraries together cost several hundred ms of startup. None of them is
+# needed for --help, argument errors or plain .txt extraction, so each is
+# imported on first use by the function that needs it.
+
+class NullWriter:
+    def write(self, *args, **kwargs): pass
+    def flush(self, *args, **kwargs): pass
+
+def _import_piper():
+    """Import piper on first use, muting its noisy import-time stderr unless --debug."""
+    try:
+        if DEBUG:
+            from piper import PiperVoice
+        else:
+            old_stderr = sys.stderr
+            sys.stderr = NullWriter()
+            try:
+                from piper import PiperVoice
+            finally:
+                sys.stderr = old_stderr
+        return PiperVoice
+    except ImportError:
+        sys.stderr.write("Error: piper-tts not installed. Install with: python3 -m pip install piper-tts\n")
+        sys.exit(1)
+    except Exception as e:
+        sys.stderr.write(f"Critical error during Piper import/setup: {e}\n")
+        sys.exit(1)
 
-# --- Mutagen (MP3 Tagging & OGG Tagging) ---
-try:
-    import mutagen.mp3
-    import mutagen.id3
-    import mutagen.oggvorbis
-    from mutagen.id3 import CHAP, TIT2, TXXX, WXXX, TPE1, APIC
-except ImportError:
-    sys.stderr.write("Error: mutagen not installed. Install with: python3 -m pip install mutagen\n")
-    sys.exit(1)
-
-# --- Piper import with optional stderr suppression (keep startup noise quiet) ---
-try:
-    # Detect debug flag early
-    DEBUG = "--debug" in sys.argv or "-d" in sys.argv
-
-    if not DEBUG:
-        class NullWriter:
-            def write(self, *args, **kwargs): pass
-            def flush(self, *args, **kwargs): pass
-
-        old_stderr = sys.stderr
-        sys.stderr = NullWriter()
-
-    from piper import PiperVoice
-
-    if DEBUG and 'old_stderr' in globals():
-        sys.stderr = old_stderr
-
-except ImportError:
-    sys.stderr.write("Error: piper-tts not installed. Install with: python3 -m pip install piper-tts\n")
-    sys.exit(1)
-except Exception as e:
-    sys.stderr.write(f"Critical error during Piper import/setup: {e}\n")
-    sys.exit(1)
+def _import_mutagen():
+    """Import mutagen on first use; only tagging and marker code needs it."""
+    try:
+        import mutagen.mp3
+        import mutagen.id3
+        import mutagen.oggvorbis
+    except ImportError:
+        sys.stderr.write("Error: mutagen not installed. Install with: python3 -m pip install mutagen\n")
+        sys.exit(1)
+    return mutagen
 
 # --- Configuration ---
 DEFAULT_MODEL_NAME = "de_DE-thorsten-high.onnx"
@@ -106,39 +152,357 @@ except Exception:
 SILENCE_PRE_SECONDS = 0.5
 SILENCE_POST_SECONDS = 5.0
 
-# --- Document format dependencies ---
-try:
-    from docx import Document  # used in unified document extractor
-except ImportError:
-    sys.stderr.write(_("Error: python-docx not found. Install with: sudo apt install python3-docx\n"))
-    sys.exit(1)
+# Pre-compiled patterns; safe_filename and the splitters run per chapter.
+_RE_TITLE_SEP = re.compile(r'[_\-\.]')
+_RE_MULTI_WS = re.compile(r'\s{2,}')
+class _SafeFilenameTable(dict):
+    """str.translate table: keep word chars, whitespace and dashes, drop the rest.
 
-try:
-    from odf.opendocument import load  # used in unified document extractor
-    from odf import text as odf_text
-except ImportError:
-    sys.stderr.write(_("Error: python3-odf not found. Install with: sudo apt install python3-odf\n"))
-    sys.exit(1)
+    Codepoints are classified once on first sight and memoized, so repeated
+    chapter titles translate in a single C-level pass with no regex scans.
+    """
+    def __missing__(self, code):
+        ch = chr(code)
+        keep = ch.isalnum() or ch.isspace() or ch in '-_'
+        self[code] = code if keep else None
+        return self[code]
+
+_SAFE_FILENAME_TABLE = _SafeFilenameTable()
 
+# Optional in-process MP3 encoder: with lameenc installed, --mp3 streams
+# PCM straight into LAME instead of writing an OGG and re-encoding via ffmpeg.
 try:
-    import ebooklib
-    from ebooklib import epub
+    import lameenc
 except ImportError:
-    sys.stderr.write(_("Error: python3-ebooklib not found. Install with: pip install ebooklib\n"))
-    sys.exit(1)
+    lameenc = None
+
+# --- Worker setup for parallel chapter synthesis ---
+def _init_chapter_worker():
+    # One ONNX intra-op thread per worker process, otherwise N workers x
+    # N ORT threads thrash the caches instead of speeding anything up.
+    global _ORT_THREADS
+    os.environ["OMP_NUM_THREADS"] = "1"
+    _ORT_THREADS = 1
+
+# --- Cached voice loading ---
+# 0 = let onnxruntime pick; overridden by --threads and in pool workers.
+_ORT_THREADS = 0
+# Requested execution device; overridden by --device.
+_ORT_DEVICE = "cpu"
+
+_DEVICE_PROVIDERS = {
+    "cuda": "CUDAExecutionProvider",
+    "coreml": "CoreMLExecutionProvider",
+    "dml": "DmlExecutionProvider",
+}
+
+def _select_providers(ort):
+    """Return the ONNX execution-provider list for the requested device."""
+    available = ort.get_available_providers()
+    if _ORT_DEVICE == "auto":
+        wanted = [p for p in _DEVICE_PROVIDERS.values() if p in available]
+        return wanted + ["CPUExecutionProvider"]
+    provider = _DEVICE_PROVIDERS.get(_ORT_DEVICE)
+    if provider is None:
+        return ["CPUExecutionProvider"]
+    if provider not in available:
+        sys.stderr.write(_("Warning: {provider} is not available in this onnxruntime build; falling back to CPU.\n").format(provider=provider))
+        return ["CPUExecutionProvider"]
+    return [provider, "CPUExecutionProvider"]
+
+@functools.lru_cache(maxsize=1)
+def _load_voice(model_path):
+    """Load the Piper voice once per process; repeated calls reuse the session.
+
+    The onnxruntime session is built with explicit tuning (all graph
+    optimizations, configurable intra-op threads, sequential execution,
+    CPU memory arena) instead of Piper's defaults. If the installed Piper
+    doesn't expose its config/session layout, fall back to PiperVoice.load.
+    """
+    PiperVoice = _import_piper()
+    try:
+        import onnxruntime as ort
+        from piper import PiperConfig
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # ORT's own default is roughly half the cores, which leaves the
+        # matmul-bound VITS decoder underfed; use every core unless told not to.
+        opts.intra_op_num_threads = _ORT_THREADS or (os.cpu_count() or 1)
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.enable_cpu_mem_arena = True
+        opts.add_session_config_entry("session.intra_op.allow_spinning", "1")
+
+        providers = _select_providers(ort)
+        if providers[0] != "CPUExecutionProvider":
+            # Share the provider's arena-based allocators across sessions so
+            # a GPU run doesn't duplicate device buffers per session.
+            opts.add_session_config_entry("session.use_env_allocators", "1")
+
+        with open(f"{model_path}.json", "r", encoding="utf-8") as config_file:
+            config = PiperConfig.from_dict(json.load(config_file))
+        session = ort.InferenceSession(
+            model_path, sess_options=opts, providers=providers
+        )
+        return PiperVoice(config=config, session=session)
+    except Exception as e:
+        logging.debug("Tuned ONNX session unavailable (%s); using Piper defaults.", e)
+        return PiperVoice.load(model_path)
+
+# --- Paragraph preparation for TTS ---
+# Sentence boundaries via a fixed-width lookbehind: no alternation, no
+# backtracking, one linear scan even over pathological paragraphs.
+_RE_SENTENCE_SPLIT = re.compile(r'(?<=[.!?…])\s+')
+# Paragraphs longer than this are re-chunked at sentence boundaries so one
+# runaway paragraph (scanned books often lose their blank lines) can't
+# dominate a padded batch or stall a single ONNX run for minutes.
+MAX_PARAGRAPH_CHARS = 1000
+
+def _split_long_paragraph(paragraph):
+    """Split an overlong paragraph at sentence ends into bounded pieces.
+
+    A piece without any sentence-ending punctuation stays whole regardless
+    of length; audio output is unchanged either way since Piper synthesizes
+    sentence by sentence internally.
+    """
+    if len(paragraph) <= MAX_PARAGRAPH_CHARS:
+        return [paragraph]
+    pieces = []
+    current = []
+    current_len = 0
+    for sentence in _RE_SENTENCE_SPLIT.split(paragraph):
+        if current and current_len + len(sentence) > MAX_PARAGRAPH_CHARS:
+            pieces.append(" ".join(current))
+            current = []
+            current_len = 0
+        current.append(sentence)
+        current_len += len(sentence) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+def _paragraphs_for_tts(text_content):
+    """Split a segment's text on blank lines, then bound paragraph length."""
+    paragraphs = []
+    for p in text_content.split("\n\n"):
+        if p.strip():
+            paragraphs.extend(_split_long_paragraph(p))
+    return paragraphs or [text_content]
+
+# --- Phonemization cache ---
+# espeak-ng phonemization is a pure text -> phoneme-id mapping, and real books
+# repeat short strings constantly ("***", "Kapitel 3", stock phrases). The
+# cached id arrays are tiny next to the PCM they produce, so a few thousand
+# entries cost almost nothing. Keyed by voice identity because different
+# voices map phonemes to different ids.
+_PHONEME_ID_CACHE = collections.OrderedDict()
+_PHONEME_ID_CACHE_MAX = 8192
+# espeak-ng keeps global state and is not thread-safe; every phonemize call
+# from --tts-concurrency worker threads must be serialized behind this lock.
+# It also guards the cache's move_to_end/popitem mutations.
+_PHONEMIZE_LOCK = threading.Lock()
+
+def _phoneme_ids_cached(voice, text):
+    """Return the flat phoneme-id array for text, memoized per voice.
+
+    Thread-safe: lookup, espeak phonemization and cache mutation all happen
+    under _PHONEMIZE_LOCK.
+    """
+    key = (id(voice), text)
+    with _PHONEMIZE_LOCK:
+        ids = _PHONEME_ID_CACHE.get(key)
+        if ids is not None:
+            _PHONEME_ID_CACHE.move_to_end(key)
+            return ids
+        flat = []
+        for sentence_phonemes in voice.phonemize(text):
+            flat.extend(voice.phonemes_to_ids(sentence_phonemes))
+        ids = np.asarray(flat, dtype=np.int64)
+        _PHONEME_ID_CACHE[key] = ids
+        if len(_PHONEME_ID_CACHE) > _PHONEME_ID_CACHE_MAX:
+            _PHONEME_ID_CACHE.popitem(last=False)
+        return ids
+
+# --- Batched synthesis helper ---
+def _synthesize_batched(voice, paragraphs, batch_size):
+    """
+    Yield one int16 audio array per paragraph, running the ONNX model on
+    padded [B, Tmax] phoneme-id batches where the loaded voice allows it.
+
+    Batching needs access to the voice's phonemizer, its InferenceSession
+    and a model that reports per-item output lengths. Without batch support
+    the model runs one paragraph at a time through the same inputs; without
+    direct session access at all (old piper), voice.synthesize() is the
+    last resort. Audio output is identical in every tier.
+    """
+    session = getattr(voice, "session", None)
+    can_run_direct = (
+        session is not None
+        and hasattr(voice, "phonemize")
+        and hasattr(voice, "phonemes_to_ids")
+    )
+    can_batch = (
+        batch_size > 1
+        and can_run_direct
+        and any(o.name == "output_lengths" for o in session.get_outputs())
+    )
+
+    if not can_batch:
+        if can_run_direct:
+            # One paragraph per run, same inputs as the batched path below.
+            # Phonemization goes through the locked cache (espeak-ng is not
+            # thread-safe); session.run releases the GIL, so inference from
+            # --tts-concurrency worker threads still overlaps.
+            config = voice.config
+            scales = np.array(
+                [config.noise_scale, config.length_scale, config.noise_w],
+                dtype=np.float32,
+            )
+            for para in paragraphs:
+                ids = _phoneme_ids_cached(voice, para)
+                inputs = {
+                    "input": ids[np.newaxis, :],
+                    "input_lengths": np.array([len(ids)], dtype=np.int64),
+                    "scales": scales[np.newaxis, :],
+                }
+                row = session.run(["output"], inputs)[0][0]
+                pcm = np.clip(row.reshape(-1), -1.0, 1.0)
+                yield (pcm * 32767).astype(np.int16)
+            return
+        # Legacy fallback without direct session access: espeak lives inside
+        # voice.synthesize, so the whole call has to sit behind the lock.
+        for para in paragraphs:
+            with _PHONEMIZE_LOCK:
+                chunks = [chunk.audio_int16_array for chunk in voice.synthesize(para)]
+            yield from chunks
+        return
+
+    config = voice.config
+    scales = np.array(
+        [config.noise_scale, config.length_scale, config.noise_w],
+        dtype=np.float32,
+    )
+
+    id_lists = [_phoneme_ids_cached(voice, para) for para in paragraphs]
+
+    # Batch paragraphs of similar length together so the [B, Tmax] padding
+    # wastes as few FLOPs as possible, then emit results in source order.
+    order = sorted(range(len(id_lists)), key=lambda i: len(id_lists[i]))
+    results = [None] * len(id_lists)
+
+    for start in range(0, len(order), batch_size):
+        indices = order[start:start + batch_size]
+        window = [id_lists[i] for i in indices]
+        lengths = np.array([len(ids) for ids in window], dtype=np.int64)
+        t_max = int(lengths.max()) if len(lengths) else 0
+        batch = np.stack([
+            np.pad(ids, (0, t_max - len(ids))) for ids in window
+        ])
+        inputs = {
+            "input": batch,
+            "input_lengths": lengths,
+            "scales": np.tile(scales, (len(window), 1)),
+        }
+        audio, out_lengths = session.run(["output", "output_lengths"], inputs)[:2]
+        for i, row, n_samples in zip(indices, audio, out_lengths):
+            pcm = np.clip(row.reshape(-1)[: int(n_samples)], -1.0, 1.0)
+            results[i] = (pcm * 32767).astype(np.int16)
+
+    yield from results
+
+# ~1 MiB of int16 samples between libsndfile calls
+WRITE_BUFFER_SAMPLES = 1 << 19
+
+class _BufferedAudioWriter:
+    """Batch many small Piper chunks into large writes to libsndfile.
+
+    Each SoundFile.write crosses Python -> libsndfile -> libvorbis down to a
+    write syscall; buffering chunks into ~1 MiB blocks cuts that per-chunk cost.
+    """
+
+    def __init__(self, sound_file, buffer_samples=WRITE_BUFFER_SAMPLES):
+        self._file = sound_file
+        self._buf = np.empty(buffer_samples, dtype=np.int16)
+        self._pos = 0
+
+    def write(self, samples):
+        n = len(samples)
+        if self._pos + n > len(self._buf):
+            self.flush()
+        if n > len(self._buf):
+            self._file.write(samples)
+            return
+        self._buf[self._pos:self._pos + n] = samples
+        self._pos += n
+
+    def flush(self):
+        if self._pos:
+            self._file.write(self._buf[:self._pos])
+            self._pos = 0
+
+def _synthesize_segment_array(voice, text_content, batch_size):
+    """Synthesize one whole segment and return its audio as a single int16 array."""
+    paragraphs = _paragraphs_for_tts(text_content)
+    arrays = list(_synthesize_batched(voice, paragraphs, batch_size))
+    return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int16)
+
+# --- Per-segment PCM cache (opt-in via --cache) ---
+# Raw int16 PCM per segment, keyed by voice/speed/text; re-runs after small
+# edits only pay synthesis for the segments that actually changed.
+_PCM_CACHE_DIR = None
+
+def _segment_cache_path(model_path, speed_rate, text_content):
+    import hashlib
+    key = hashlib.blake2b(
+        f"{model_path}\x00{speed_rate!r}\x00{text_content}".encode("utf-8")
+    ).hexdigest()
+    return _PCM_CACHE_DIR / f"{key}.s16"
+
+def _cached_segment_array(voice, model_path, speed_rate, text_content, batch_size):
+    """Return one segment's PCM, probing and filling the on-disk cache."""
+    cache_file = _segment_cache_path(model_path, speed_rate, text_content)
+    if cache_file.exists():
+        cached = np.fromfile(cache_file, dtype=np.int16)
+        # An empty entry can't be real synthesis output (segments always
+        # contain text); treat it as a miss rather than emitting silence.
+        if cached.size:
+            return cached
+    audio_array = _synthesize_segment_array(voice, text_content, batch_size)
+    # Fill through a temp name plus atomic rename - the same idiom as the
+    # .part outputs - so an interrupted write (Ctrl-C, kill, disk full) can
+    # never leave a truncated entry that a later run would silently play
+    # back as shortened audio. The pid keeps parallel workers that race on
+    # the same key from interleaving into one temp file.
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.part")
+    try:
+        audio_array.tofile(tmp_file)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logging.debug("Could not write segment cache %s: %s", cache_file, e)
+    finally:
+        if tmp_file.exists():
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+    return audio_array
 
 # --- Utility: generate silence array ---
+@functools.lru_cache(maxsize=8)
 def generate_silence_array(duration_seconds, sample_rate):
-    """Return a 1-D int16 numpy array with silence for duration_seconds."""
+    """Return a cached, read-only 1-D int16 numpy array with silence for duration_seconds."""
     num_samples = int(duration_seconds * sample_rate)
-    return np.zeros(num_samples, dtype=np.int16)
+    silence = np.zeros(num_samples, dtype=np.int16)
+    silence.setflags(write=False)  # shared between calls, so guard against mutation
+    return silence
 
 # --- Title extraction from path ---
 def get_title_from_path(input_path):
     """Return a cleaned title from a file path stem."""
     name = input_path.stem
-    name = re.sub(r'[_\-\.]', ' ', name)
-    name = re.sub(r'\s{2,}', ' ', name).strip()
+    name = _RE_TITLE_SEP.sub(' ', name)
+    name = _RE_MULTI_WS.sub(' ', name).strip()
     title = name.title()
     return title
 
@@ -146,6 +510,14 @@ def get_title_from_path(input_path):
 def extract_segments_from_epub(input_path):
     """Extract segments from EPUB using TOC order and return (segments, metadata)."""
     import time
+    try:
+        import ebooklib
+        from ebooklib import epub
+        from lxml import etree, html
+    except ImportError:
+        sys.stderr.write(_("Error: python3-ebooklib not found. Install with: pip install ebooklib\n"))
+        sys.exit(1)
+
     t0 = time.time()
     book = epub.read_epub(input_path)
 
@@ -156,12 +528,20 @@ def extract_segments_from_epub(input_path):
 
     segments = []
     content_cache = {}
+    # ebooklib's get_item_with_href scans all items per call; resolve TOC
+    # hrefs (minus any #anchor) through one dict instead.
+    items_by_href = {
+        item.get_name(): item
+        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
+    }
 
     def fast_extract_text(xhtml_bytes):
+        # tostring(method='text') aggregates all descendant text in C;
+        # split/join then collapses whitespace without a Python loop.
         try:
             doc = html.fromstring(xhtml_bytes)
-            texts = doc.xpath('//body//text()')
-            return " ".join(t.strip() for t in texts if t.strip())
+            body = doc.body if doc.body is not None else doc
+            return " ".join(etree.tostring(body, method="text", encoding="unicode").split())
         except Exception:
             return ""
 
@@ -175,14 +555,15 @@ def extract_segments_from_epub(input_path):
         if not href:
             continue
 
-        if href in content_cache:
-            text_content = content_cache[href]
+        base_href = href.split('#')[0]
+        if base_href in content_cache:
+            text_content = content_cache[base_href]
         else:
-            item = book.get_item_with_href(href)
+            item = items_by_href.get(base_href)
             if not item:
                 continue
             text_content = fast_extract_text(item.content)
-            content_cache[href] = text_content
+            content_cache[base_href] = text_content
 
         if text_content.strip():
             segments.append((title, text_content))
@@ -191,14 +572,67 @@ def extract_segments_from_epub(input_path):
     return segments, metadata
 
 # --- TXT extraction ---
+def _iter_paragraphs(lines):
+    """Yield paragraphs from an iterable of lines, flushing on blank lines."""
+    buf = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            buf.append(stripped)
+        elif buf:
+            yield "\n".join(buf)
+            buf = []
+    if buf:
+        yield "\n".join(buf)
+
 def extract_segments_from_txt(path):
-    """Segment text file by paragraphs (two or more newlines)."""
+    """Segment text file by blank-line separated paragraphs, reading line by line.
+
+    Streaming keeps memory constant instead of materializing the whole file
+    plus a second copy for the split.
+    """
     with open(path, "r", encoding="utf-8") as f:
-        text = f.read()
-    paragraphs = [p.strip() for p in re.split(r'\n{2,}', text) if p.strip()]
-    segments = [(_("Segment {n}").format(n=i+1), p) for i, p in enumerate(paragraphs)]
+        segments = [(_("Segment {n}").format(n=i+1), p) for i, p in enumerate(_iter_paragraphs(f))]
     return segments, {}
 
+# --- ODT fast path: parse content.xml/meta.xml directly with lxml ---
+_ODF_NS = {
+    "text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0",
+    "office": "urn:oasis:names:tc:opendocument:xmlns:office:1.0",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+
+def _extract_odt_paragraphs(file_path):
+    """Return (style-name, text) pairs via one compiled XPath over content.xml.
+
+    Avoids odfpy's per-paragraph Python node traversal; itertext() joins the
+    text content of each paragraph at C level.
+    """
+    import zipfile
+    from lxml import etree
+
+    with zipfile.ZipFile(file_path) as zf:
+        root = etree.XML(zf.read("content.xml"))
+
+    style_attr = "{%s}style-name" % _ODF_NS["text"]
+    find_paragraphs = etree.XPath("//text:p | //text:h", namespaces=_ODF_NS)
+    return [
+        (p.get(style_attr) or "", "".join(p.itertext()).strip())
+        for p in find_paragraphs(root)
+    ]
+
+def _extract_odt_metadata(file_path):
+    """Return (title, author) from meta.xml, or (None, None) if absent."""
+    import zipfile
+    from lxml import etree
+
+    with zipfile.ZipFile(file_path) as zf:
+        root = etree.XML(zf.read("meta.xml"))
+
+    title = root.findtext(".//dc:title", namespaces=_ODF_NS)
+    author = root.findtext(".//dc:creator", namespaces=_ODF_NS)
+    return title, author
+
 # --- Unified DOCX/ODT extractor ---
 def extract_segments_from_document(file_path):
     """
@@ -215,6 +649,12 @@ def extract_segments_from_document(file_path):
     metadata = {"title": None, "author": None}
 
     if ext == ".docx":
+        try:
+            from docx import Document
+        except ImportError:
+            sys.stderr.write(_("Error: python-docx not found. Install with: sudo apt install python3-docx\n"))
+            sys.exit(1)
+
         doc = Document(file_path)
         for p in doc.paragraphs:
             style = p.style.name if p.style else ""
@@ -241,11 +681,34 @@ def extract_segments_from_document(file_path):
             metadata["author"] = props.author
 
     elif ext == ".odt":
-        doc = load(str(file_path))
-        paragraphs = doc.getElementsByType(odf_text.P)
-        for p in paragraphs:
-            text_content = "".join(t.data for t in p.childNodes if t.nodeType == t.TEXT_NODE).strip()
-            style_name = p.getAttribute("stylename") or ""
+        try:
+            paragraphs = _extract_odt_paragraphs(file_path)
+            odt_title, odt_author = _extract_odt_metadata(file_path)
+            if odt_title:
+                metadata["title"] = odt_title
+            if odt_author:
+                metadata["author"] = odt_author
+        except Exception:
+            # Unusual archive layout: fall back to odfpy's object model.
+            try:
+                from odf.opendocument import load
+                from odf import text as odf_text
+            except ImportError:
+                sys.stderr.write(_("Error: python3-odf not found. Install with: sudo apt install python3-odf\n"))
+                sys.exit(1)
+
+            doc = load(str(file_path))
+            paragraphs = []
+            for p in doc.getElementsByType(odf_text.P):
+                p_text = "".join(t.data for t in p.childNodes if t.nodeType == t.TEXT_NODE).strip()
+                paragraphs.append((p.getAttribute("stylename") or "", p_text))
+            meta = doc.meta
+            if hasattr(meta, "title") and meta.title:
+                metadata["title"] = meta.title
+            if hasattr(meta, "creator") and meta.creator:
+                metadata["author"] = meta.creator
+
+        for style_name, text_content in paragraphs:
             if not text_content:
                 continue
             if style_name.lower().startswith("heading") or "überschrift" in style_name.lower():
@@ -261,12 +724,6 @@ def extract_segments_from_document(file_path):
         elif not segments and current_text:
             segments = [(pathlib.Path(file_path).stem, "\n".join(current_text).strip())]
 
-        meta = doc.meta
-        if hasattr(meta, "title") and meta.title:
-            metadata["title"] = meta.title
-        if hasattr(meta, "creator") and meta.creator:
-            metadata["author"] = meta.creator
-
     else:
         raise ValueError(f"Unsupported document type: {ext}")
 
@@ -299,7 +756,7 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
             if final_out.exists():
                 print(gettext_func("Warning: output file already exists: {file}").format(file=final_out.name))
                 return
-            synthesize_separate_chapter(title, text, model_path, out_ogg, metadata, args.speed, args.mp3)
+            synthesize_separate_chapter(title, text, model_path, out_ogg, metadata, args.speed, args.mp3, args.batch_size)
             return
         else:
             print(gettext_func("Warning: chapter {n} not found (document has {m} chapters).").format(n=idx, m=num_chapters))
@@ -322,9 +779,9 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
 
         if selection == "a":
             print(gettext_func("\n→ Synthesizing all chapters into a combined OGG..."))
-            text_to_ogg(segments, model_path, str(input_path.with_suffix(".ogg")), metadata, args.speed)
+            text_to_ogg(segments, model_path, str(input_path.with_suffix(".ogg")), metadata, args.speed, args.batch_size, tts_concurrency=args.tts_concurrency)
             if args.mp3:
-                convert_ogg_to_mp3(input_path.with_suffix(".ogg"), input_path.with_suffix(".mp3"))
+                convert_to_mp3(input_path.with_suffix(".ogg"), input_path.with_suffix(".mp3"))
             print(gettext_func("✅ Combined synthesis finished."))
             return
 
@@ -332,6 +789,7 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
             print(gettext_func("\n→ Synthesizing each chapter to separate files..."))
             base_path = input_path.parent
             base_name = input_path.stem
+            jobs = []
             for i, (title, text) in enumerate(segments, 1):
                 safe_file_name = safe_filename(title, i)
                 ogg_chapter_path = base_path / f"{base_name}_{safe_file_name}.ogg"
@@ -340,12 +798,33 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
                 if final_output.exists():
                     print(gettext_func("Skipping chapter '{title}': output file '{file}' already exists.").format(title=title, file=final_output.name))
                     continue
-                try:
-                    synthesize_separate_chapter(title, text, model_path, ogg_chapter_path, metadata, args.speed, args.mp3)
-                except Exception as e:
-                    sys.stderr.write(gettext_func("Error synthesizing chapter {n} ('{title}'): {msg}\n").format(n=i, title=title, msg=e))
-                    if ogg_chapter_path.exists(): os.remove(ogg_chapter_path)
-                    if mp3_chapter_path.exists(): os.remove(mp3_chapter_path)
+                jobs.append((i, title, text, ogg_chapter_path, mp3_chapter_path))
+
+            # Chapters are independent files, so fan them out across cores.
+            # Each worker process loads the voice once via _load_voice.
+            # Spawn rather than fork: the logging QueueListener thread is
+            # already running by now, and forking a multi-threaded process
+            # can deadlock children on inherited locks.
+            max_workers = max(1, min(len(jobs), (os.cpu_count() or 2) // 2))
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_chapter_worker,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        synthesize_separate_chapter, title, text, model_path,
+                        chapter_ogg, metadata, args.speed, args.mp3, args.batch_size
+                    ): (i, title, chapter_ogg, chapter_mp3)
+                    for i, title, text, chapter_ogg, chapter_mp3 in jobs
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    i, title, chapter_ogg, chapter_mp3 = futures[future]
+                    e = future.exception()
+                    if e is not None:
+                        sys.stderr.write(gettext_func("Error synthesizing chapter {n} ('{title}'): {msg}\n").format(n=i, title=title, msg=e))
+                        if chapter_ogg.exists(): os.remove(chapter_ogg)
+                        if chapter_mp3.exists(): os.remove(chapter_mp3)
             print(gettext_func("✅ All chapters processed in split-file mode."))
             return
 
@@ -359,7 +838,7 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
                 if final_out.exists():
                     print(gettext_func("Warning: output file already exists: {file}").format(file=final_out.name))
                     return
-                synthesize_separate_chapter(title, text, model_path, out_ogg, metadata, args.speed, args.mp3)
+                synthesize_separate_chapter(title, text, model_path, out_ogg, metadata, args.speed, args.mp3, args.batch_size)
                 print(gettext_func("✅ Single chapter finished."))
             else:
                 print(gettext_func("Warning: chapter {n} not found (document has {m} chapters).").format(n=idx, m=num_chapters))
@@ -373,10 +852,23 @@ def run_chapter_logic(segments, cli_chapters_value, input_path, model_path, meta
     return
 
 # --- Streaming TTS to OGG + markers (single-file output) ---
-def text_to_ogg(segments, model_path, output_file, metadata, speed_rate: float = 1.0):
-    """Stream audio using Piper, capture precise marker times and write OGG file."""
-    print(_("Loading voice from: {file}").format(file=model_path))
-    voice = PiperVoice.load(model_path)
+def text_to_ogg(segments, model_path, output_file, metadata, speed_rate: float = 1.0, batch_size: int = 1, voice=None, tts_concurrency: int = 1, markers=None, resume_markers=None):
+    """Stream audio using Piper, capture precise marker times and write OGG file.
+
+    An already-loaded voice can be passed in; otherwise the process-wide
+    cached session for model_path is (re)used. With tts_concurrency > 1,
+    segments are synthesized by a thread pool (ORT releases the GIL during
+    inference) and written out strictly in source order so markers stay exact.
+
+    The caller may supply the markers list; it is appended to as segments
+    start, so an exception handler sees exactly how far synthesis got.
+    With resume_markers (from a previous run's sidecar) and output_file
+    pointing at that run's partial file, the finished audio is carried over
+    and synthesis picks up at the first incomplete segment.
+    """
+    if voice is None:
+        print(_("Loading voice from: {file}").format(file=model_path))
+        voice = _load_voice(model_path)
     sample_rate = voice.config.sample_rate
 
     if speed_rate != 1.0:
@@ -386,8 +878,27 @@ def text_to_ogg(segments, model_path, output_file, metadata, speed_rate: float =
     total_chars = sum(len(text) for _, text in segments)
     logging.debug(_("Synthesizing ({n} characters in {m} segments)...").format(n=total_chars, m=len(segments)))
 
-    markers = []
-    current_time_seconds = 0.0
+    if markers is None:
+        markers = []
+    # Count whole samples; float-second accumulation drifts over hours of audio.
+    current_samples = 0
+
+    # The last sidecar marker belongs to the segment that was mid-synthesis
+    # when the previous run died: keep all audio before it, redo that one.
+    # A title mismatch means the input changed since, so start from scratch.
+    if resume_markers:
+        resume_index = len(resume_markers) - 1
+        if resume_index >= len(segments) or resume_markers[resume_index]['title'] != segments[resume_index][0]:
+            resume_markers = None
+    resume_pcm = None
+    if resume_markers and os.path.exists(output_file):
+        keep_samples = int(resume_markers[-1]['time_seconds'] * sample_rate)
+        try:
+            data, part_rate = sf.read(output_file, dtype='int16')
+            if part_rate == sample_rate and len(data) >= keep_samples > 0:
+                resume_pcm = data[:keep_samples]
+        except Exception as e:
+            logging.debug("Could not reuse partial output %s: %s", output_file, e)
 
     pre_silence_array = generate_silence_array(SILENCE_PRE_SECONDS, sample_rate)
     post_silence_array = generate_silence_array(SILENCE_POST_SECONDS, sample_rate)
@@ -400,30 +911,106 @@ def text_to_ogg(segments, model_path, output_file, metadata, speed_rate: float =
         format="OGG",
         subtype="VORBIS",
     ) as f:
-        f.write(pre_silence_array)
-        current_time_seconds += SILENCE_PRE_SECONDS
-
-        for title, text_content in segments:
-            markers.append({'time_seconds': current_time_seconds, 'title': title})
-            print(_("  -> Segment started: {title} at {time:.2f}s").format(title=title, time=current_time_seconds))
-
-            paragraphs = [p for p in text_content.split("\n\n") if p.strip()]
-            if not paragraphs:
-                paragraphs = [text_content]
-
-            for para in paragraphs:
-                for chunk in voice.synthesize(para):
-                    f.write(chunk.audio_int16_array)
-                    chunk_duration_seconds = len(chunk.audio_int16_array) / sample_rate
-                    current_time_seconds += chunk_duration_seconds
-
-        f.write(post_silence_array)
-        current_time_seconds += SILENCE_POST_SECONDS
+        # Title/artist go through libsndfile into the Vorbis header on close;
+        # only the chapter markers (times unknown until now) need a post-pass.
+        f.title = metadata.get('title', _('Unknown Title'))
+        f.artist = metadata.get('artist', _('Piper TTS'))
+
+        writer = _BufferedAudioWriter(f)
+        if resume_pcm is not None:
+            writer.write(resume_pcm)
+            current_samples = len(resume_pcm)
+            markers.extend(resume_markers[:-1])
+            remaining = segments[len(resume_markers) - 1:]
+            print(_("→ Resuming partial output: {n} of {m} segments already synthesized.").format(n=len(resume_markers) - 1, m=len(segments)))
+        else:
+            writer.write(pre_silence_array)
+            current_samples += len(pre_silence_array)
+            remaining = segments
+
+        if tts_concurrency > 1:
+            # Keep at most concurrency+1 segments of PCM in flight; drain the
+            # oldest future first so the file and markers stay in source order.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=tts_concurrency) as pool:
+                in_flight = collections.deque()
+                next_submit = 0
+                while next_submit < len(remaining) or in_flight:
+                    while next_submit < len(remaining) and len(in_flight) <= tts_concurrency:
+                        title, text_content = remaining[next_submit]
+                        if _PCM_CACHE_DIR is not None:
+                            future = pool.submit(_cached_segment_array, voice, model_path, speed_rate, text_content, batch_size)
+                        else:
+                            future = pool.submit(_synthesize_segment_array, voice, text_content, batch_size)
+                        in_flight.append((title, future))
+                        next_submit += 1
+                    title, future = in_flight.popleft()
+                    audio_array = future.result()
+                    start_seconds = current_samples / sample_rate
+                    markers.append({'time_seconds': start_seconds, 'title': title})
+                    log.info(_("  -> Segment started: %s at %.2fs"), title, start_seconds)
+                    writer.write(audio_array)
+                    current_samples += len(audio_array)
+        else:
+            # Overlap synthesis with the Vorbis encode + file write: finished
+            # PCM goes through a small queue to a dedicated writer thread, so
+            # segment N+1 runs through ONNX while segment N is still being
+            # encoded. Sample accounting stays on the producer side, which
+            # keeps marker times exact and in source order.
+            write_queue = queue.Queue(maxsize=2)
+            write_errors = []
+
+            def _drain_writes():
+                while True:
+                    chunk = write_queue.get()
+                    if chunk is None:
+                        return
+                    if not write_errors:
+                        try:
+                            writer.write(chunk)
+                        except Exception as e:
+                            # Keep draining so the producer never blocks on a
+                            # full queue; the error is re-raised after join.
+                            write_errors.append(e)
+
+            writer_thread = threading.Thread(target=_drain_writes, name="ogg-writer")
+            writer_thread.start()
+            try:
+                for title, text_content in remaining:
+                    # A failed write (e.g. disk full) dooms the whole file;
+                    # stop synthesizing instead of burning hours on segments
+                    # that can never be written.
+                    if write_errors:
+                        break
+                    start_seconds = current_samples / sample_rate
+                    markers.append({'time_seconds': start_seconds, 'title': title})
+                    log.info(_("  -> Segment started: %s at %.2fs"), title, start_seconds)
+
+                    if _PCM_CACHE_DIR is not None:
+                        audio_array = _cached_segment_array(voice, model_path, speed_rate, text_content, batch_size)
+                        write_queue.put(audio_array)
+                        current_samples += len(audio_array)
+                        continue
+
+                    paragraphs = _paragraphs_for_tts(text_content)
+
+                    for audio_array in _synthesize_batched(voice, paragraphs, batch_size):
+                        if write_errors:
+                            break
+                        write_queue.put(audio_array)
+                        current_samples += len(audio_array)
+            finally:
+                write_queue.put(None)
+                writer_thread.join()
+            if write_errors:
+                raise write_errors[0]
+
+        writer.write(post_silence_array)
+        current_samples += len(post_silence_array)
+        writer.flush()
 
     try:
+        mutagen = _import_mutagen()
         audio = mutagen.oggvorbis.OggVorbis(output_file)
-        audio['title'] = [metadata.get('title', _('Unknown Title'))]
-        audio['artist'] = [metadata.get('artist', _('Piper TTS'))]
 
         keys_to_delete = [k for k in audio.keys() if k.startswith('chapter_')]
         for k in keys_to_delete:
@@ -433,38 +1020,251 @@ def text_to_ogg(segments, model_path, output_file, metadata, speed_rate: float =
             audio[f'chapter_start_time_{i}'] = [str(marker['time_seconds'])]
             audio[f'chapter_title_{i}'] = [marker['title']]
 
-        audio.save()
+        # Reserve some comment padding so later tag edits (e.g. the MP3
+        # reuse branch) can rewrite the header page in place.
+        audio.save(padding=lambda info: max(info.padding, 4096))
         print(_("✅ Chapter markers and metadata written to OGG Vorbis comments."))
     except Exception as e:
         sys.stderr.write(_("Warning: Failed to write OGG Vorbis markers: {msg}\n").format(msg=e))
 
     print(_("✅ OGG file successfully written: {file}").format(file=output_file))
-    print(_("Total duration: {time:.2f}s").format(time=current_time_seconds))
+    print(_("Total duration: {time:.2f}s").format(time=current_samples / sample_rate))
+    return markers
+
+# --- Streaming TTS directly to MP3 (skips the intermediate OGG) ---
+# Empty ID3v2.3 tag reserved at the front of in-process MP3 encodes. With
+# the space already there, write_mp3_chapter_tags overwrites the header in
+# place instead of shifting the whole file to make room for the frames.
+_ID3_RESERVED_BYTES = 8192
+
+def _reserve_id3_header(fileobj, size=_ID3_RESERVED_BYTES):
+    """Write an empty, padded ID3v2.3 tag of exactly `size` bytes."""
+    body = size - 10
+    fileobj.write(
+        b"ID3\x03\x00\x00"
+        + bytes([(body >> 21) & 0x7F, (body >> 14) & 0x7F, (body >> 7) & 0x7F, body & 0x7F])
+        + b"\x00" * body
+    )
+
+def text_to_mp3(segments, model_path, output_file, metadata, speed_rate: float = 1.0, batch_size: int = 1, voice=None, markers=None):
+    """Stream audio from Piper straight into an in-process LAME encoder.
+
+    Avoids the intermediate OGG write plus the full Vorbis-decode/LAME-encode
+    pass that ffmpeg conversion costs. Only called when lameenc is installed.
+    """
+    if voice is None:
+        print(_("Loading voice from: {file}").format(file=model_path))
+        voice = _load_voice(model_path)
+    sample_rate = voice.config.sample_rate
+
+    if speed_rate != 1.0:
+        voice.config.speed = speed_rate
+        print(_("-> TTS speed adjusted to: {speed} (1.0 = normal)").format(speed=speed_rate))
+
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(320)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(1)
+    encoder.set_quality(2)
+
+    if markers is None:
+        markers = []
+    current_samples = 0
+
+    pre_silence_array = generate_silence_array(SILENCE_PRE_SECONDS, sample_rate)
+    post_silence_array = generate_silence_array(SILENCE_POST_SECONDS, sample_rate)
+
+    with open(output_file, "wb") as f:
+        _reserve_id3_header(f)
+        f.write(encoder.encode(pre_silence_array.tobytes()))
+        current_samples += len(pre_silence_array)
+
+        for title, text_content in segments:
+            start_seconds = current_samples / sample_rate
+            markers.append({'time_seconds': start_seconds, 'title': title})
+            log.info(_("  -> Segment started: %s at %.2fs"), title, start_seconds)
+
+            paragraphs = _paragraphs_for_tts(text_content)
+
+            for audio_array in _synthesize_batched(voice, paragraphs, batch_size):
+                f.write(encoder.encode(audio_array.tobytes()))
+                current_samples += len(audio_array)
+
+        f.write(encoder.encode(post_silence_array.tobytes()))
+        current_samples += len(post_silence_array)
+        f.write(encoder.flush())
+
+    print(_("✅ MP3 file successfully written: {file}").format(file=output_file))
+    print(_("Total duration: {time:.2f}s").format(time=current_samples / sample_rate))
+    return markers
+
+def text_to_mp3_via_ffmpeg(segments, model_path, output_file, metadata, speed_rate: float = 1.0, batch_size: int = 1, voice=None, markers=None):
+    """Pipe raw PCM from Piper into ffmpeg's stdin for one-pass MP3 encoding.
+
+    Fallback for --mp3 when lameenc is missing: still skips the temporary
+    OGG file and its extra Vorbis encode/decode round-trip.
+    """
+    if voice is None:
+        print(_("Loading voice from: {file}").format(file=model_path))
+        voice = _load_voice(model_path)
+    sample_rate = voice.config.sample_rate
+
+    if speed_rate != 1.0:
+        voice.config.speed = speed_rate
+        print(_("-> TTS speed adjusted to: {speed} (1.0 = normal)").format(speed=speed_rate))
+
+    if markers is None:
+        markers = []
+    current_samples = 0
+
+    pre_silence_array = generate_silence_array(SILENCE_PRE_SECONDS, sample_rate)
+    post_silence_array = generate_silence_array(SILENCE_POST_SECONDS, sample_rate)
+
+    proc = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-f", "s16le",
+            "-ar", str(sample_rate),
+            "-ac", "1",
+            "-i", "pipe:0",
+            "-f", "mp3",
+            "-codec:a", "libmp3lame",
+            "-b:a", "320k",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-y",
+            str(output_file)
+        ],
+        stdin=subprocess.PIPE,
+        # 1 MiB pipe buffer: PCM arrives in sub-second chunks, and the
+        # default 8 KiB buffering would mean a write syscall per chunk.
+        bufsize=1 << 20,
+    )
+    try:
+        proc.stdin.write(pre_silence_array.tobytes())
+        current_samples += len(pre_silence_array)
+
+        for title, text_content in segments:
+            start_seconds = current_samples / sample_rate
+            markers.append({'time_seconds': start_seconds, 'title': title})
+            log.info(_("  -> Segment started: %s at %.2fs"), title, start_seconds)
+
+            paragraphs = _paragraphs_for_tts(text_content)
+
+            for audio_array in _synthesize_batched(voice, paragraphs, batch_size):
+                proc.stdin.write(audio_array.tobytes())
+                current_samples += len(audio_array)
+
+        proc.stdin.write(post_silence_array.tobytes())
+        current_samples += len(post_silence_array)
+    finally:
+        proc.stdin.close()
+        returncode = proc.wait()
+
+    if returncode != 0:
+        raise RuntimeError(_("ffmpeg exited with status {code}").format(code=returncode))
+
+    print(_("✅ MP3 file successfully written: {file}").format(file=output_file))
+    print(_("Total duration: {time:.2f}s").format(time=current_samples / sample_rate))
     return markers
 
 # --- Read custom OGG markers ---
-def read_ogg_markers(ogg_path):
-    """Read custom chapter markers from OGG Vorbis comments."""
-    print(_("Attempting to read custom markers from existing OGG file..."))
+def _read_ogg_comments_fast(ogg_path):
+    """Parse the Vorbis comment packet straight out of the file's first pages.
+
+    The comment header lives right behind the identification header, so only
+    the start of the file is touched instead of opening the whole
+    multi-hundred-MB audiobook through a tag library. Returns a lowercased
+    key -> value dict, or None if the header doesn't parse cleanly (e.g. a
+    comment packet spanning pages), in which case the caller falls back.
+    """
+    import mmap
+    import struct
+
+    try:
+        with open(ogg_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(b"\x03vorbis", 0, 1 << 20)
+            if start < 0:
+                return None
+            pos = start + len(b"\x03vorbis")
+            vendor_length, = struct.unpack_from("<I", mm, pos)
+            pos += 4 + vendor_length
+            count, = struct.unpack_from("<I", mm, pos)
+            pos += 4
+
+            comments = {}
+            for _i in range(count):
+                length, = struct.unpack_from("<I", mm, pos)
+                pos += 4
+                raw = mm[pos:pos + length]
+                pos += length
+                if len(raw) != length:
+                    return None
+                key, sep, value = raw.partition(b"=")
+                if not sep:
+                    return None
+                comments[key.decode("ascii", "ignore").lower()] = value.decode("utf-8", "replace")
+            return comments
+    except (OSError, ValueError, struct.error):
+        return None
+
+def _markers_from_comments(comments):
     markers = []
+    i = 0
+    while True:
+        time_value = comments.get(f'chapter_start_time_{i}')
+        title_value = comments.get(f'chapter_title_{i}')
+        if time_value is None or title_value is None:
+            break
+        try:
+            markers.append({'time_seconds': float(time_value), 'title': title_value})
+        except ValueError:
+            return []
+        i += 1
+    return markers
+
+def read_sidecar_markers(audio_path):
+    """Return markers from a '<name>.markers.json' sidecar, or None if absent.
+
+    Interrupted runs leave this sidecar next to their partial output; a plain
+    json.load beats parsing the audio container when it is available.
+    """
+    sidecar = audio_path.with_name(audio_path.name + ".markers.json")
+    if not sidecar.exists():
+        return None
     try:
-        audio = mutagen.oggvorbis.OggVorbis(ogg_path)
-        i = 0
-        while True:
-            time_key = f'chapter_start_time_{i}'
-            title_key = f'chapter_title_{i}'
-            if time_key in audio and title_key in audio:
-                time_s = float(audio[time_key][0])
-                title = audio[title_key][0]
-                markers.append({'time_seconds': time_s, 'title': title})
-                i += 1
-            else:
-                break
-        if markers:
-            print(_("✅ Successfully read {n} precise markers from OGG file.").format(n=len(markers)))
-            return markers
-    except Exception:
+        with open(sidecar, "r", encoding="utf-8") as f:
+            markers = json.load(f)
+    except (OSError, ValueError):
         return None
+    if markers and all('time_seconds' in m and 'title' in m for m in markers):
+        return markers
+    return None
+
+def read_ogg_markers(ogg_path):
+    """Read custom chapter markers from OGG Vorbis comments."""
+    markers = read_sidecar_markers(ogg_path)
+    if markers:
+        print(_("✅ Read {n} markers from the sidecar file.").format(n=len(markers)))
+        return markers
+
+    print(_("Attempting to read custom markers from existing OGG file..."))
+
+    comments = _read_ogg_comments_fast(ogg_path)
+    markers = _markers_from_comments(comments) if comments else []
+
+    if not markers:
+        # Unusual header layout: let mutagen do the full parse.
+        try:
+            mutagen = _import_mutagen()
+            audio = mutagen.oggvorbis.OggVorbis(ogg_path)
+            markers = _markers_from_comments({k.lower(): v[0] for k, v in audio.items()})
+        except Exception:
+            return None
+
+    if markers:
+        print(_("✅ Successfully read {n} precise markers from OGG file.").format(n=len(markers)))
+        return markers
     return None
 
 # --- Approximate markers fallback ---
@@ -473,27 +1273,32 @@ def calculate_approximate_markers(segments, ogg_path):
     print(_("Calculating approximate markers from existing OGG file..."))
     try:
         with sf.SoundFile(ogg_path, 'r') as f:
-            total_ogg_duration = f.frames / f.samplerate
+            total_frames = f.frames
+            samplerate = f.samplerate
     except Exception as e:
         sys.stderr.write(_("Error reading OGG duration for marker calculation: {msg}\n").format(msg=e))
         return []
 
-    fixed_silence_duration = SILENCE_PRE_SECONDS + SILENCE_POST_SECONDS
-    tts_duration = max(0, total_ogg_duration - fixed_silence_duration)
+    pre_silence_frames = int(SILENCE_PRE_SECONDS * samplerate)
+    post_silence_frames = int(SILENCE_POST_SECONDS * samplerate)
+    tts_frames = max(0, total_frames - pre_silence_frames - post_silence_frames)
     total_chars = sum(len(text) for _, text in segments)
-    if total_chars == 0 or tts_duration == 0:
+    if total_chars == 0 or tts_frames == 0:
         return []
 
-    current_time_seconds = SILENCE_PRE_SECONDS
+    # One cumulative sum over character counts, all in whole samples, instead
+    # of a Python-level float accumulator with a division per segment.
+    lengths = np.fromiter((len(text) for _, text in segments), dtype=np.int64, count=len(segments))
+    char_offsets = np.concatenate(([0], np.cumsum(lengths[:-1])))
+    sample_offsets = pre_silence_frames + char_offsets * tts_frames // total_chars
+
     markers = []
-    for title, text_content in segments:
-        markers.append({'time_seconds': current_time_seconds, 'title': title})
-        char_ratio = len(text_content) / total_chars
-        segment_duration = tts_duration * char_ratio
-        current_time_seconds += segment_duration
-        print(_("  -> Approximate segment start: {title} at {time:.2f}s").format(title=title, time=markers[-1]['time_seconds']))
-
-    print(_("Total approximate duration used for calculation: {time:.2f}s").format(time=current_time_seconds + SILENCE_POST_SECONDS - SILENCE_PRE_SECONDS))
+    for (title, _text), start_samples in zip(segments, sample_offsets.tolist()):
+        start_seconds = start_samples / samplerate
+        markers.append({'time_seconds': start_seconds, 'title': title})
+        log.info(_("  -> Approximate segment start: %s at %.2fs"), title, start_seconds)
+
+    print(_("Total approximate duration used for calculation: {time:.2f}s").format(time=(tts_frames + post_silence_frames) / samplerate))
     return markers
 
 # --- FFmpeg check and conversion ---
@@ -505,30 +1310,38 @@ def check_ffmpeg_installed():
         sys.stderr.write(_("Fatal: ffmpeg is required for MP3 conversion but was not found. Please install ffmpeg.\n"))
         return False
 
-def convert_ogg_to_mp3(ogg_path, mp3_path, delete_ogg=True):
-    print(_("Converting OGG to MP3 (CBR 320k)..."))
+def convert_to_mp3(audio_path, mp3_path, delete_source=True):
+    """Convert any ffmpeg-readable audio file (OGG, FLAC, WAV, ...) to MP3."""
+    print(_("Converting {file} to MP3 (CBR 320k)...").format(file=pathlib.Path(audio_path).name))
+    # ffmpeg writes into a .part name; the atomic rename below means a failed
+    # or interrupted conversion never leaves a truncated file under mp3_path.
+    part_path = pathlib.Path(mp3_path).with_name(pathlib.Path(mp3_path).name + ".part")
     try:
         subprocess.run(
             [
                 "ffmpeg",
-                "-i", str(ogg_path),
+                "-i", str(audio_path),
+                "-f", "mp3",
                 "-codec:a", "libmp3lame",
                 "-b:a", "320k",
                 "-ac", "2",
                 "-hide_banner",
                 "-loglevel", "error",
                 "-y",
-                str(mp3_path)
+                str(part_path)
             ],
             check=True
         )
+        os.replace(part_path, mp3_path)
         print(_("✅ MP3 file successfully converted: {file}").format(file=mp3_path))
-        if delete_ogg:
-            os.remove(ogg_path)
-            print(_("→ Temporary OGG file deleted: {file}").format(file=ogg_path))
+        if delete_source:
+            os.remove(audio_path)
+            print(_("→ Intermediate file deleted: {file}").format(file=audio_path))
         return True
     except subprocess.CalledProcessError as e:
         sys.stderr.write(_("Error during MP3 conversion (ffmpeg failed): {msg}\n").format(msg=e))
+        if part_path.exists():
+            os.remove(part_path)
         return False
     except FileNotFoundError:
         sys.stderr.write(_("Error: ffmpeg command not found.\n"))
@@ -536,6 +1349,7 @@ def convert_ogg_to_mp3(ogg_path, mp3_path, delete_ogg=True):
 
 def write_mp3_chapter_tags(mp3_path, markers, metadata):
     print(_("Writing chapter markers and metadata to MP3..."))
+    mutagen = _import_mutagen()
     try:
         audio = mutagen.mp3.MP3(mp3_path)
         audio.tags = mutagen.id3.ID3()
@@ -543,29 +1357,37 @@ def write_mp3_chapter_tags(mp3_path, markers, metadata):
         book_title = metadata.get('title', _('Unknown Title'))
         book_artist = metadata.get('artist', _('Piper TTS'))
 
-        audio.tags.add(TIT2(encoding=3, text=[book_title]))
-        audio.tags.add(TPE1(encoding=3, text=[book_artist]))
-
-        chapter_frame_id = 0
-        for marker in markers:
-            chapter_frame_id += 1
-            start_ms = int(marker['time_seconds'] * 1000)
-            if chapter_frame_id < len(markers):
-                end_ms = int(markers[chapter_frame_id]['time_seconds'] * 1000)
-            else:
-                end_ms = 0
-            chap = CHAP(
-                element_id=f"chp_{chapter_frame_id}".encode('latin-1'),
-                start_time=start_ms,
-                end_time=end_ms,
-                start_offset=0,
-                end_offset=0
-            )
-            sub_title = TIT2(encoding=3, text=[marker['title']])
-            chap.subframes = {'TIT2': sub_title}
-            audio.tags.add(chap)
+        audio.tags.add(mutagen.id3.TIT2(encoding=3, text=[book_title]))
+        audio.tags.add(mutagen.id3.TPE1(encoding=3, text=[book_artist]))
 
-        audio.save(v2_version=3)
+        if markers:
+            # Each chapter ends where the next begins; the last one ends at
+            # the file's total length (it used to get end_time=0, which
+            # breaks skip-to-next navigation in some players).
+            starts_ms = (np.array([m['time_seconds'] for m in markers]) * 1000).astype(np.int64)
+            total_ms = int(audio.info.length * 1000)
+            ends_ms = np.append(starts_ms[1:], max(total_ms, int(starts_ms[-1])))
+
+            for chapter_frame_id, (marker, start_ms, end_ms) in enumerate(
+                zip(markers, starts_ms.tolist(), ends_ms.tolist()), 1
+            ):
+                chap = mutagen.id3.CHAP(
+                    element_id=f"chp_{chapter_frame_id}".encode('latin-1'),
+                    start_time=start_ms,
+                    end_time=end_ms,
+                    start_offset=0,
+                    end_offset=0
+                )
+                sub_title = mutagen.id3.TIT2(encoding=3, text=[marker['title']])
+                chap.subframes = {'TIT2': sub_title}
+                audio.tags.add(chap)
+
+        # Keep the tag inside the reserved header when it fits; only grow the
+        # file (one rewrite, re-reserving space) when the frames outgrow it.
+        audio.save(
+            v2_version=3,
+            padding=lambda info: info.padding if info.padding >= 0 else _ID3_RESERVED_BYTES,
+        )
         print(_("✅ Metadata written successfully (Title: '{title}', Artist: '{artist}').").format(title=book_title, artist=book_artist))
     except Exception as e:
         sys.stderr.write(_("Error writing MP3 chapter tags: {msg}\n").format(msg=e))
@@ -575,18 +1397,18 @@ def write_mp3_chapter_tags(mp3_path, markers, metadata):
 
 # --- Single chapter synthesis helper ---
 def safe_filename(title, counter):
-    safe_name = re.sub(r'[^\w\s\-]', '', title).strip()
-    safe_name = re.sub(r'\s+', '_', safe_name)
+    safe_name = '_'.join(title.translate(_SAFE_FILENAME_TABLE).split())
     safe_name = safe_name[:50]
     return f"{counter:02d}_{safe_name}"
 
-def synthesize_separate_chapter(title, text_content, model_path, output_path, metadata, speed_rate, convert_to_mp3):
-    voice = PiperVoice.load(model_path)
+def synthesize_separate_chapter(title, text_content, model_path, output_path, metadata, speed_rate, to_mp3, batch_size=1, voice=None):
+    if voice is None:
+        voice = _load_voice(model_path)
     sample_rate = voice.config.sample_rate
     if speed_rate != 1.0:
         voice.config.speed = speed_rate
 
-    current_time_seconds = 0.0
+    current_samples = 0
     pre_silence_array = generate_silence_array(SILENCE_PRE_SECONDS, sample_rate)
     post_silence_array = generate_silence_array(SILENCE_POST_SECONDS, sample_rate)
 
@@ -599,45 +1421,104 @@ def synthesize_separate_chapter(title, text_content, model_path, output_path, me
         format="OGG",
         subtype="VORBIS",
     ) as f:
-        f.write(pre_silence_array)
-        current_time_seconds += SILENCE_PRE_SECONDS
+        # Written into the Vorbis header on close; no mutagen post-pass needed.
+        f.title = title
+        f.artist = metadata.get('artist', _('Piper TTS'))
 
-        paragraphs = [p for p in text_content.split("\n\n") if p.strip()]
-        if not paragraphs:
-            paragraphs = [text_content]
+        writer = _BufferedAudioWriter(f)
+        writer.write(pre_silence_array)
+        current_samples += len(pre_silence_array)
 
-        for para in paragraphs:
-            for chunk in voice.synthesize(para):
-                f.write(chunk.audio_int16_array)
-                chunk_duration_seconds = len(chunk.audio_int16_array) / sample_rate
-                current_time_seconds += chunk_duration_seconds
+        paragraphs = _paragraphs_for_tts(text_content)
 
-        f.write(post_silence_array)
-        current_time_seconds += SILENCE_POST_SECONDS
+        for audio_array in _synthesize_batched(voice, paragraphs, batch_size):
+            writer.write(audio_array)
+            current_samples += len(audio_array)
 
-    print(_("  -> OGG saved: {file} (Duration: {time:.2f}s)").format(file=output_path.name, time=current_time_seconds))
+        writer.write(post_silence_array)
+        current_samples += len(post_silence_array)
+        writer.flush()
 
-    try:
-        audio = mutagen.oggvorbis.OggVorbis(str(output_path))
-        audio['title'] = [title]
-        audio['artist'] = [metadata.get('artist', _('Piper TTS'))]
-        audio.save()
-    except Exception as e:
-        sys.stderr.write(_("Warning: Failed to write OGG Vorbis metadata for single chapter: {msg}\n").format(msg=e))
+    print(_("  -> OGG saved: {file} (Duration: {time:.2f}s)").format(file=output_path.name, time=current_samples / sample_rate))
 
-    if convert_to_mp3:
+    if to_mp3:
         mp3_path = output_path.with_suffix(".mp3")
-        if convert_ogg_to_mp3(output_path, mp3_path, delete_ogg=True):
+        if convert_to_mp3(output_path, mp3_path, delete_source=True):
             try:
+                mutagen = _import_mutagen()
                 mp3_audio = mutagen.mp3.MP3(mp3_path)
                 mp3_audio.tags = mutagen.id3.ID3()
-                mp3_audio.tags.add(TIT2(encoding=3, text=[title]))
-                mp3_audio.tags.add(TPE1(encoding=3, text=[metadata.get('artist', _('Piper TTS'))]))
+                mp3_audio.tags.add(mutagen.id3.TIT2(encoding=3, text=[title]))
+                mp3_audio.tags.add(mutagen.id3.TPE1(encoding=3, text=[metadata.get('artist', _('Piper TTS'))]))
                 mp3_audio.save(v2_version=3)
                 print(_("  -> MP3 tagged: {file}").format(file=mp3_path.name))
             except Exception as e:
                 sys.stderr.write(_("Error writing simple MP3 tags: {msg}\n").format(msg=e))
 
+# --- Optional INT8 quantization of the voice model ---
+def ensure_quantized(model_path):
+    """Return the path of an INT8-quantized copy of the model, creating it once.
+
+    Dynamic quantization roughly halves memory bandwidth for the matmul-heavy
+    synthesis on INT8-capable CPUs at a small quality cost, hence opt-in via
+    --quantize. Falls back to the FP32 model if quantization is unavailable.
+    """
+    import shutil
+
+    model_path = pathlib.Path(model_path)
+    quantized_path = model_path.with_suffix(".int8.onnx")
+    quantized_config = pathlib.Path(f"{quantized_path}.json")
+
+    if not quantized_path.exists():
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            sys.stderr.write(_("Warning: onnxruntime.quantization not available; using the FP32 model.\n"))
+            return str(model_path)
+        print(_("Quantizing voice model to INT8 (one-time): {file}").format(file=quantized_path))
+        try:
+            quantize_dynamic(str(model_path), str(quantized_path), weight_type=QuantType.QInt8)
+        except Exception as e:
+            sys.stderr.write(_("Warning: quantization failed ({msg}); using the FP32 model.\n").format(msg=e))
+            if quantized_path.exists():
+                os.remove(quantized_path)
+            return str(model_path)
+
+    # Piper expects the voice config next to the model file.
+    source_config = pathlib.Path(f"{model_path}.json")
+    if source_config.exists() and not quantized_config.exists():
+        shutil.copyfile(source_config, quantized_config)
+
+    print(_("Using quantized voice: {file}").format(file=quantized_path))
+    return str(quantized_path)
+
+# --- Partial-output preservation after a failed/interrupted run ---
+def _keep_partial_output(part_path, final_output_path, markers):
+    """Keep the .part file plus a markers sidecar so finished audio survives.
+
+    An empty .part (nothing synthesized yet) is removed instead.
+    """
+    if part_path.exists() and markers:
+        sidecar = final_output_path.with_name(final_output_path.name + ".markers.json")
+        try:
+            with open(sidecar, "w", encoding="utf-8") as f:
+                json.dump(markers, f, ensure_ascii=False, indent=2)
+            print(_("→ Partial output kept: {file} (segment markers in {sidecar}).").format(file=part_path.name, sidecar=sidecar.name))
+        except OSError:
+            pass
+    elif part_path.exists():
+        os.remove(part_path)
+
+def _discard_markers_sidecar(final_output_path):
+    """Remove a leftover markers sidecar once its audio is fully written.
+
+    A stale sidecar would otherwise shadow the real Vorbis-comment markers
+    in read_ogg_markers on the next run.
+    """
+    sidecar = final_output_path.with_name(final_output_path.name + ".markers.json")
+    if sidecar.exists():
+        os.remove(sidecar)
+
 # --- Find model path ---
 def find_model_path(voice_arg):
     if voice_arg:
@@ -675,6 +1556,14 @@ def main():
     parser.add_argument("--voice", type=str, default=None, help=_("Optional ONNX voice file path"))
     parser.add_argument("-m", "--mp3", action="store_true", help=_("Convert OGG output to MP3 format with chapter tags (requires ffmpeg)"))
     parser.add_argument("-s", "--speed", type=float, default=1.0, help=_("TTS speech rate multiplier (1.0 = normal, 0.9 = slower)"))
+    parser.add_argument("-b", "--batch-size", type=int, default=1, help=_("Paragraphs per batched ONNX run (1 = serial; needs a voice model with batch support)"))
+    parser.add_argument("--threads", type=int, default=0, help=_("ONNX intra-op threads for synthesis (0 = all cores)"))
+    parser.add_argument("--tts-concurrency", type=int, default=1, help=_("Segments to synthesize in parallel (output order is preserved)"))
+    parser.add_argument("--cache", action="store_true", help=_("Cache synthesized segment audio in ~/.cache/hoerbuch so re-runs only synthesize changed text"))
+    parser.add_argument("-f", "--force", action="store_true", help=_("Overwrite an existing output file instead of exiting"))
+    parser.add_argument("--device", choices=["cpu", "cuda", "coreml", "dml", "auto"], default="cpu", help=_("ONNX execution device; 'auto' picks the first available accelerator"))
+    parser.add_argument("--gpu", action="store_true", help=_("Shortcut for --device auto: use a GPU/accelerator when available, CPU otherwise"))
+    parser.add_argument("--quantize", action="store_true", help=_("Use an INT8-quantized copy of the voice model (faster on CPU, slightly lower quality)"))
 
     # parse raw string for -k and normalize later
     parser.add_argument("-k", "--chapters",
@@ -693,6 +1582,23 @@ def main():
     # Setup logging according to debug flag
     setup_logging(debug=args.debug)
 
+    global _ORT_THREADS
+    if args.threads:
+        _ORT_THREADS = args.threads
+    elif args.tts_concurrency > 1:
+        # Keep workers x intra-op threads within the core count.
+        _ORT_THREADS = max(1, (os.cpu_count() or 1) // args.tts_concurrency)
+    if args.gpu and args.device == "cpu":
+        args.device = "auto"
+    if args.device != "cpu":
+        global _ORT_DEVICE
+        _ORT_DEVICE = args.device
+    if args.cache:
+        global _PCM_CACHE_DIR
+        cache_root = pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache"))
+        _PCM_CACHE_DIR = cache_root / "hoerbuch" / "segments"
+        _PCM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
     # Normalize chapter argument robustly
     chapters_raw = args.chapters
     chapter_value = False
@@ -759,17 +1665,42 @@ def main():
     print(_("Using title: '{title}', artist: '{artist}'").format(title=metadata["title"], artist=metadata["artist"]))
 
     if args.chapters:
+        # Quantize only once chapter mode is really going to synthesize;
+        # the existence checks inside run_chapter_logic stay cheap.
+        if args.quantize:
+            model_path = ensure_quantized(model_path)
         run_chapter_logic(segments, args.chapters, input_path, model_path, metadata, args)
         return
 
     final_output_path = mp3_path if args.mp3 else ogg_path
-    if final_output_path.exists():
+
+    # An MP3 that already carries one CHAP frame per segment is a finished
+    # run of this very document; report success instead of the error exit.
+    if args.mp3 and final_output_path.exists() and not args.force:
+        try:
+            mutagen = _import_mutagen()
+            existing_tags = mutagen.mp3.MP3(final_output_path).tags
+            chap_count = len(existing_tags.getall('CHAP')) if existing_tags else 0
+        except Exception:
+            chap_count = 0
+        if chap_count == len(segments):
+            print(_("✅ '{file}' already contains all {n} chapters. Nothing to do.").format(file=final_output_path.name, n=len(segments)))
+            sys.exit(0)
+
+    if final_output_path.exists() and not args.force:
         print(_("🛑 Output file '{file}' already exists. Skipping synthesis/conversion.").format(file=final_output_path))
-        print(_("→ Please rename or delete the existing file if you wish to regenerate the audio."))
+        print(_("→ Please rename or delete the existing file, or pass --force to regenerate the audio."))
         sys.exit(1)
 
+    # Synthesize into a .part file and rename onto the final name only on
+    # success, so an interrupted run never leaves a truncated output behind.
+    part_path = final_output_path.with_name(final_output_path.name + ".part")
+
+    # Shared with the synthesis functions below: they append a marker as each
+    # segment starts, so the error handlers see exactly how far a run got.
+    markers = []
+
     try:
-        markers = []
         synthesize_needed = True
 
         if args.mp3 and ogg_path.exists():
@@ -783,28 +1714,56 @@ def main():
                 markers = calculate_approximate_markers(segments, ogg_path)
                 synthesize_needed = False
 
-        if synthesize_needed:
-            markers = text_to_ogg(segments, model_path, str(ogg_path), metadata, args.speed)
+        if synthesize_needed and args.quantize:
+            model_path = ensure_quantized(model_path)
 
-        if args.mp3:
-            if convert_ogg_to_mp3(ogg_path, mp3_path, delete_ogg=synthesize_needed):
-                write_mp3_chapter_tags(mp3_path, markers, metadata)
+        if synthesize_needed and args.mp3 and lameenc is not None:
+            print(_("Encoding MP3 in-process (lameenc); skipping the intermediate OGG."))
+            markers = text_to_mp3(segments, model_path, str(part_path), metadata, args.speed, args.batch_size, markers=markers)
+            write_mp3_chapter_tags(part_path, markers, metadata)
+            os.replace(part_path, mp3_path)
+            _discard_markers_sidecar(mp3_path)
+            return
+
+        if synthesize_needed and args.mp3:
+            print(_("Piping PCM straight into ffmpeg; skipping the intermediate OGG."))
+            markers = text_to_mp3_via_ffmpeg(segments, model_path, str(part_path), metadata, args.speed, args.batch_size, markers=markers)
+            write_mp3_chapter_tags(part_path, markers, metadata)
+            os.replace(part_path, mp3_path)
+            _discard_markers_sidecar(mp3_path)
+            return
 
+        if synthesize_needed:
+            # A .part plus markers sidecar from an earlier interrupted run is
+            # picked up here: its finished segments are carried over instead
+            # of being synthesized again.
+            resume_markers = read_sidecar_markers(ogg_path) if part_path.exists() else None
+            markers = text_to_ogg(segments, model_path, str(part_path), metadata, args.speed, args.batch_size, tts_concurrency=args.tts_concurrency, markers=markers, resume_markers=resume_markers)
+            os.replace(part_path, ogg_path)
+            _discard_markers_sidecar(ogg_path)
+
+    except KeyboardInterrupt:
+        sys.stderr.write(_("\nInterrupted by user.\n"))
+        _keep_partial_output(part_path, final_output_path, markers)
+        raise
     except Exception as e:
-        sys.stderr.write(_("Critical error: {msg}\n").format(msg=e))
-        if args.debug and "old_stderr" in globals():
+        sys.stderr.write(_("Critical error during synthesis: {msg}\n").format(msg=e))
+        if args.debug:
             import traceback
-            traceback.print_exc(file=old_stderr)
-
-        if ogg_path.exists() and synthesize_needed:
-            os.remove(ogg_path)
-            print(_("→ Temporary OGG file deleted after error."))
-        if mp3_path.exists() and args.mp3:
-            os.remove(mp3_path)
-            print(_("→ Partial MP3 file deleted after error."))
-
+            traceback.print_exc()
+        _keep_partial_output(part_path, final_output_path, markers)
         sys.exit(1)
 
+    # Conversion and tagging run outside the synthesis guard on purpose: if
+    # ffmpeg or the tag write fails here, the finished OGG survives so the
+    # next --mp3 run takes the fast reuse branch instead of re-synthesizing.
+    if args.mp3:
+        if convert_to_mp3(ogg_path, mp3_path, delete_source=synthesize_needed):
+            write_mp3_chapter_tags(mp3_path, markers, metadata)
+            _discard_markers_sidecar(mp3_path)
+        else:
+            sys.exit(1)
+
 if __name__ == "__main__":
     main()
 